@@ -1,12 +1,19 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import shutil
 import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
 
 import mysql.connector
+from mysql.connector import pooling
 from mysql.connector.connection import MySQLConnection
 
 
@@ -15,6 +22,116 @@ CONFIG_PATH = Path(__file__).with_name("db_param.json")
 
 ConnectionType = Union[MySQLConnection, sqlite3.Connection]
 
+# Databases whose 'files' schema has already been verified in this process,
+# so building another Database for the same target skips the DDL round-trip
+_SCHEMA_READY: set = set()
+_SCHEMA_LOCK = threading.Lock()
+
+
+# Constant SQL used by the helper methods, written in MySQL placeholder
+# style. Per-engine variants are substituted once per Database instance
+# (see self._stmt), so the hot paths never rewrite placeholders at call time.
+_STATEMENTS: Dict[str, str] = {
+    "insert_file": (
+        "INSERT INTO files (filename, mime_type, file_size, file_data, sha256) "
+        "VALUES (%s, %s, %s, %s, %s)"
+    ),
+    "insert_file_returning": (
+        "INSERT INTO files (filename, mime_type, file_size, file_data, sha256) "
+        "VALUES (%s, %s, %s, %s, %s) RETURNING id"
+    ),
+    "get_by_id": (
+        "SELECT id, filename, mime_type, file_size, file_data, sha256 "
+        "FROM files WHERE id = %s"
+    ),
+    "get_for_export": "SELECT filename, file_data, sha256 FROM files WHERE id = %s",
+    "get_last": (
+        "SELECT id, filename, mime_type, file_size, file_data, sha256 "
+        "FROM files ORDER BY id DESC LIMIT 1"
+    ),
+    "get_last_meta": (
+        "SELECT id, filename, mime_type, file_size, sha256 "
+        "FROM files ORDER BY id DESC LIMIT 1"
+    ),
+    "get_all": (
+        "SELECT id, filename, mime_type, file_size, sha256 "
+        "FROM files ORDER BY id DESC"
+    ),
+    "get_page": (
+        "SELECT id, filename, mime_type, file_size, sha256 "
+        "FROM files ORDER BY id DESC LIMIT %s OFFSET %s"
+    ),
+    "get_preview": (
+        "SELECT id, filename, mime_type, file_size, sha256, "
+        "substr(file_data, 1, %s) AS file_data FROM files WHERE id = %s"
+    ),
+    "count": "SELECT COUNT(*) AS n FROM files",
+    "sha_probe": "SELECT id FROM files WHERE sha256 = %s",
+    "exists": "SELECT 1 FROM files WHERE id = %s",
+    "get_chunk": "SELECT substr(file_data, %s, %s) AS chunk FROM files WHERE id = %s",
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _load_params_cached(path_str: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parse and validate db_param.json.
+
+    Keyed by (path, mtime) so edits to the file invalidate the cache while
+    unchanged files are decoded only once per process.
+    """
+    data = json.loads(Path(path_str).read_text())
+
+    engine = str(data.get("engine", "mysql")).lower()
+    if engine not in {"mysql", "sqlite"}:
+        raise ValueError("db_param.json 'engine' must be either 'mysql' or 'sqlite'")
+
+    if engine == "mysql":
+        required_keys = ["host", "user", "password", "database"]
+        missing = [k for k in required_keys if not data.get(k)]
+        if missing:
+            raise ValueError(
+                f"Missing required MySQL fields in db_param.json: {missing}"
+            )
+
+        # Default port if not provided
+        if "port" not in data or not data["port"]:
+            data["port"] = 3306
+
+    elif engine == "sqlite":
+        if not data.get("database"):
+            raise ValueError(
+                "For SQLite, db_param.json must contain 'database' (file name/path)"
+            )
+
+    return data
+
+
+class _ChunkReader:
+    """
+    Minimal read()-only file object over an iterator of byte chunks.
+
+    Lets shutil.copyfileobj drive a Database.get_file_stream generator
+    from its tight C-level copy loop instead of a Python for-loop.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            parts = [self._buffer, *self._chunks]
+            self._buffer = b""
+            return b"".join(parts)
+        while len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        out, self._buffer = self._buffer[:size], self._buffer[size:]
+        return out
+
 
 class Database:
     """
@@ -28,40 +145,52 @@ class Database:
         self.config_path: Path = config_path or CONFIG_PATH
         self.params: Dict[str, Any] = self._load_params()
         self.engine: str = self.params.get("engine", "mysql").lower()
-        self._ensure_files_table()
+
+        # Reused connections: MySQL gets a small pool, SQLite a single
+        # shared connection guarded by a lock. Both are created lazily on
+        # first _acquire().
+        self._pool: Optional[pooling.MySQLConnectionPool] = None
+        self._sqlite_conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.RLock()
+
+        # MySQL driver selection. By default mysql.connector is used with
+        # its C extension when installed (protocol parsing and row
+        # materialization in C instead of Python); db_param.json may set
+        # "driver": "mysqlclient" to go through libmysqlclient instead.
+        self._driver: str = str(self.params.get("driver", "")).lower()
+        self._use_pure: bool = not getattr(mysql.connector, "HAVE_CEXT", False)
+        self._mysqldb_conn = None
+
+        # Named statements with placeholders substituted for this engine;
+        # query()/execute() recognize these and skip _prepare_sql entirely
+        self._stmt: Dict[str, str] = {
+            name: sql.replace("%s", "?") if self.engine == "sqlite" else sql
+            for name, sql in _STATEMENTS.items()
+        }
+        self._stmt_texts = set(self._stmt.values())
+
+        # Whether INSERT ... RETURNING is available; resolved lazily on
+        # first single-row insert (needs a server round trip on MySQL)
+        self._supports_returning: Optional[bool] = None
+
+        # Schema DDL runs lazily on the first _acquire(), on the same warm
+        # connection that serves the first real statement
+        self._schema_checked = False
 
     # ----- configuration and connection -----
 
     def _load_params(self) -> Dict[str, Any]:
-        """Load connection parameters from the JSON config file."""
+        """
+        Load connection parameters from the JSON config file.
+
+        Parsing is cached per (path, mtime), so repeated Database
+        construction only re-reads the file after it actually changed.
+        """
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
 
-        data = json.loads(self.config_path.read_text())
-
-        engine = str(data.get("engine", "mysql")).lower()
-        if engine not in {"mysql", "sqlite"}:
-            raise ValueError("db_param.json 'engine' must be either 'mysql' or 'sqlite'")
-
-        if engine == "mysql":
-            required_keys = ["host", "user", "password", "database"]
-            missing = [k for k in required_keys if not data.get(k)]
-            if missing:
-                raise ValueError(
-                    f"Missing required MySQL fields in db_param.json: {missing}"
-                )
-
-            # Default port if not provided
-            if "port" not in data or not data["port"]:
-                data["port"] = 3306
-
-        elif engine == "sqlite":
-            if not data.get("database"):
-                raise ValueError(
-                    "For SQLite, db_param.json must contain 'database' (file name/path)"
-                )
-
-        return data
+        mtime = self.config_path.stat().st_mtime
+        return dict(_load_params_cached(str(self.config_path), mtime))
 
     def _sqlite_path(self) -> Path:
         """Return absolute path for SQLite database file."""
@@ -73,31 +202,171 @@ class Database:
         return db_path
 
     def get_connection(self) -> ConnectionType:
-        """Create and return a new connection for the selected engine."""
+        """
+        Create and return a new standalone connection for the selected engine.
+
+        Internal queries go through _acquire(), which reuses connections;
+        this method always opens a fresh one and the caller owns closing it.
+        """
         engine = self.engine
         if engine == "mysql":
+            if self._driver == "mysqlclient":
+                return self._mysqldb_connect()
             return mysql.connector.connect(
-                host=self.params["host"],
-                port=self.params["port"],
-                user=self.params["user"],
-                password=self.params["password"],
-                database=self.params["database"],
+                use_pure=self._use_pure, **self._mysql_params()
             )
         if engine == "sqlite":
-            return sqlite3.connect(self._sqlite_path())
+            conn = sqlite3.connect(self._sqlite_path())
+            self._apply_sqlite_pragmas(conn)
+            return conn
 
         raise ValueError(f"Unsupported engine: {engine}")
 
+    def _mysql_params(self) -> Dict[str, Any]:
+        """Connection keyword arguments shared by every MySQL connect path."""
+        return {
+            "host": self.params["host"],
+            "port": self.params["port"],
+            "user": self.params["user"],
+            "password": self.params["password"],
+            "database": self.params["database"],
+        }
+
+    def _mysqldb_connect(self):
+        """
+        Open a connection through mysqlclient (the libmysqlclient binding).
+
+        mysqlclient decodes rows and BLOBs entirely in C. Its DB-API
+        surface matches what this class uses from mysql.connector (cursor,
+        execute/executemany, fetchall, lastrowid, commit, close); only the
+        password/database keywords are spelled differently.
+        """
+        import MySQLdb
+
+        p = self._mysql_params()
+        return MySQLdb.connect(
+            host=p["host"],
+            port=int(p["port"]),
+            user=p["user"],
+            passwd=p["password"],
+            db=p["database"],
+        )
+
+    @staticmethod
+    def _apply_sqlite_pragmas(conn: sqlite3.Connection) -> None:
+        """
+        Tune a fresh SQLite connection for this workload.
+
+        WAL + synchronous=NORMAL turns each commit into a WAL append instead
+        of a full journal rewrite with fsync, and mmap_size lets BLOB reads
+        come straight from memory-mapped pages. Larger pages suit our
+        BLOB-heavy rows; page_size only takes effect on databases created by
+        this connection (or after VACUUM) and must be set before WAL is on.
+        """
+        conn.execute("PRAGMA page_size=8192")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=1073741824")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+
+    @contextmanager
+    def _acquire(self) -> Iterator[ConnectionType]:
+        """
+        Yield a ready-to-use connection for the selected engine.
+
+        MySQL connections are borrowed from a pool and handed back on exit;
+        the SQLite connection is opened once, shared across calls, and never
+        closed here. Callers must not close the yielded connection.
+
+        The first acquisition also verifies the schema, so table creation
+        rides on the connection that serves the first real statement
+        instead of costing a handshake of its own.
+        """
+        if not self._schema_checked:
+            # Set the flag before the DDL runs: _create_files_table goes
+            # through _acquire itself and must not recurse into it
+            self._schema_checked = True
+            self._ensure_files_table()
+
+        if self.engine == "sqlite":
+            with self._conn_lock:
+                if self._sqlite_conn is None:
+                    # Autocommit mode; batch paths issue explicit BEGIN/COMMIT.
+                    # A larger statement cache keeps our constant SQL compiled
+                    # across calls instead of re-parsing it.
+                    self._sqlite_conn = sqlite3.connect(
+                        self._sqlite_path(),
+                        check_same_thread=False,
+                        isolation_level=None,
+                        cached_statements=256,
+                    )
+                    self._apply_sqlite_pragmas(self._sqlite_conn)
+                yield self._sqlite_conn
+            return
+
+        if self._driver == "mysqlclient":
+            # mysqlclient has no pool; share one connection under the lock,
+            # the same shape as the SQLite path
+            with self._conn_lock:
+                if self._mysqldb_conn is None:
+                    self._mysqldb_conn = self._mysqldb_connect()
+                yield self._mysqldb_conn
+            return
+
+        if self._pool is None:
+            with self._conn_lock:
+                if self._pool is None:
+                    self._pool = pooling.MySQLConnectionPool(
+                        pool_name="files",
+                        pool_size=8,
+                        use_pure=self._use_pure,
+                        host=self.params["host"],
+                        port=self.params["port"],
+                        user=self.params["user"],
+                        password=self.params["password"],
+                        database=self.params["database"],
+                    )
+        conn = self._pool.get_connection()
+        try:
+            yield conn
+        finally:
+            # close() on a pooled connection returns it to the pool
+            conn.close()
+
+    def _cursor(self, conn: ConnectionType):
+        """
+        Return a cursor for statement execution.
+
+        With mysql.connector this is a prepared-statement cursor, so a
+        constant SQL string is parsed and planned once per pooled connection
+        and only re-bound on later calls. SQLite relies on the connection's
+        internal statement cache, and mysqlclient has no prepared cursors.
+        """
+        if self.engine == "mysql" and self._driver != "mysqlclient":
+            return conn.cursor(prepared=True)
+        return conn.cursor()
+
     def check_connection(self) -> bool:
         """
         Check if the database connection can be established.
 
+        Runs SELECT 1 through _acquire(), so the check warms the shared
+        connection / pool (and triggers schema setup) that the following
+        statements will reuse, rather than opening and discarding a
+        standalone connection.
+
         Returns:
             True if connection is successful, False otherwise.
         """
         try:
-            conn = self.get_connection()
-            conn.close()
+            with self._acquire() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+                finally:
+                    cursor.close()
             return True
         except Exception as exc:
             print(f"Connection failed: {exc}")
@@ -128,15 +397,14 @@ class Database:
             sql: SQL statement with optional placeholders.
             params: Sequence of parameters for the statement.
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        try:
-            sql_to_run = self._prepare_sql(sql)
-            cursor.execute(sql_to_run, params or ())
-            conn.commit()
-        finally:
-            cursor.close()
-            conn.close()
+        with self._acquire() as conn:
+            cursor = self._cursor(conn)
+            try:
+                sql_to_run = sql if sql in self._stmt_texts else self._prepare_sql(sql)
+                cursor.execute(sql_to_run, params or ())
+                conn.commit()
+            finally:
+                cursor.close()
 
     def query(
         self,
@@ -150,26 +418,19 @@ class Database:
             sql: SELECT statement with optional placeholders.
             params: Sequence of parameters for the statement.
         """
-        conn = self.get_connection()
-        try:
-            if self.engine == "mysql":
-                cursor = conn.cursor(dictionary=True)
-            else:  # sqlite
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-            sql_to_run = self._prepare_sql(sql)
-            cursor.execute(sql_to_run, params or ())
-            rows = cursor.fetchall()
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            try:
+                sql_to_run = sql if sql in self._stmt_texts else self._prepare_sql(sql)
+                cursor.execute(sql_to_run, params or ())
+                # Build dicts straight from the driver's tuples: one dict
+                # per row instead of an intermediate Row/dict object pair
+                columns = [desc[0] for desc in cursor.description]
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
 
-            if self.engine == "sqlite":
-                # convert sqlite3.Row objects to plain dicts
-                rows = [dict(row) for row in rows]
-
-            return rows
-        finally:
-            cursor.close()
-            conn.close()
+            return [dict(zip(columns, row)) for row in rows]
 
     # ----- File storage helpers -----
 
@@ -184,40 +445,188 @@ class Database:
         """
         Insert a file record into the 'files' table.
 
+        Inserts are deduplicated by content hash: if a row with the same
+        sha256 already exists, its id is returned and the BLOB write is
+        skipped entirely.
+
         Returns:
-            The auto-increment id of the inserted row.
+            The auto-increment id of the inserted (or already present) row.
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        existing = self.query(self._stmt["sha_probe"], (sha256,))
+        if existing:
+            return int(existing[0]["id"])
+
         try:
-            sql = """
-                INSERT INTO files (filename, mime_type, file_size, file_data, sha256)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            sql_to_run = self._prepare_sql(sql)
-            cursor.execute(
-                sql_to_run, (filename, mime_type, file_size, file_data, sha256)
-            )
-            conn.commit()
-            return int(cursor.lastrowid)
-        finally:
-            cursor.close()
-            conn.close()
+            return self.insert_files(
+                [(filename, mime_type, file_size, file_data, sha256)]
+            )[0]
+        except (sqlite3.IntegrityError, mysql.connector.errors.IntegrityError):
+            # Lost a race against a concurrent insert of the same content;
+            # the row exists now, return its id
+            existing = self.query(self._stmt["sha_probe"], (sha256,))
+            if existing:
+                return int(existing[0]["id"])
+            raise
+
+    def insert_files(self, rows: Sequence[Sequence[Any]]) -> List[int]:
+        """
+        Insert many file records into the 'files' table in batches.
+
+        Each row is (filename, mime_type, file_size, file_data, sha256).
+        On SQLite the batch runs as executemany inside one explicit
+        transaction; on MySQL rows are chunked into multi-VALUES INSERT
+        statements. Either way parse, round-trip and commit costs are
+        amortized over the whole batch.
+
+        Returns:
+            The auto-increment ids of the inserted rows, in input order.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+
+        if len(rows) == 1 and self._returning_supported():
+            return [self._insert_file_returning(rows[0])]
+
+        if self.engine == "sqlite":
+            return self._insert_files_sqlite(rows)
+
+        cols_per_row = 5
+        # MySQL has no hard bound-variable limit, but huge statements stop
+        # paying off, so cap rows per chunk.
+        max_params = 2500
+        rows_per_chunk = max(1, max_params // cols_per_row)
+
+        ids: List[int] = []
+        with self._acquire() as conn:
+            cursor = self._cursor(conn)
+            try:
+                for start in range(0, len(rows), rows_per_chunk):
+                    chunk = rows[start:start + rows_per_chunk]
+                    placeholders = ",".join(["(%s, %s, %s, %s, %s)"] * len(chunk))
+                    sql = (
+                        "INSERT INTO files "
+                        "(filename, mime_type, file_size, file_data, sha256) "
+                        f"VALUES {placeholders}"
+                    )
+                    cursor.execute(
+                        self._prepare_sql(sql),
+                        list(chain.from_iterable(chunk)),
+                    )
+                    # MySQL reports the first id of a multi-row insert
+                    first_id = int(cursor.lastrowid)
+                    ids.extend(range(first_id, first_id + len(chunk)))
+                conn.commit()
+            finally:
+                cursor.close()
+        return ids
+
+    def _insert_files_sqlite(self, rows: List[Sequence[Any]]) -> List[int]:
+        """
+        SQLite batch insert: executemany inside one explicit transaction.
+
+        executemany reuses a single compiled statement, and BEGIN IMMEDIATE
+        takes the write lock up front so the whole batch is covered by one
+        commit (one WAL sync) with no bound-parameter ceiling to chunk
+        around.
+        """
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    cursor.executemany(self._stmt["insert_file"], rows)
+                    # lastrowid is unreliable after executemany; ask SQLite
+                    cursor.execute("SELECT last_insert_rowid()")
+                    last_id = int(cursor.fetchone()[0])
+                    cursor.execute("COMMIT")
+                except Exception:
+                    cursor.execute("ROLLBACK")
+                    raise
+            finally:
+                cursor.close()
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def _returning_supported(self) -> bool:
+        """
+        Whether this engine supports INSERT ... RETURNING.
+
+        SQLite grew RETURNING in 3.35; on the MySQL side only MariaDB
+        (10.5+) implements it, so the server version string is probed once
+        and the answer cached for the lifetime of this instance.
+        """
+        if self._supports_returning is None:
+            if self.engine == "sqlite":
+                self._supports_returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+            else:
+                self._supports_returning = False
+                try:
+                    version = str(self.query("SELECT VERSION()")[0]["VERSION()"])
+                    if "mariadb" in version.lower():
+                        major, minor = version.split(".")[:2]
+                        self._supports_returning = (int(major), int(minor)) >= (10, 5)
+                except Exception:
+                    pass
+        return self._supports_returning
+
+    def _insert_file_returning(self, row: Sequence[Any]) -> int:
+        """
+        Insert one file row with INSERT ... RETURNING id.
 
-    def get_all_files(self) -> List[Dict[str, Any]]:
+        The new id comes back in the same round trip as the insert, so no
+        follow-up lastrowid/last_insert_rowid() hop is needed.
+        """
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self._stmt["insert_file_returning"], tuple(row))
+                new_id = int(cursor.fetchone()[0])
+                conn.commit()
+            finally:
+                cursor.close()
+        return new_id
+
+    def get_all_files(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get all files from the 'files' table, ordered by ID descending.
 
+        This method must never select file_data: it is a metadata listing,
+        and pulling the BLOB column would transfer every stored file's
+        contents just to render a list. Use get_file_by_id / the streaming
+        helpers when the actual bytes are needed.
+
+        Args:
+            limit: Optional maximum number of rows, to keep result sets bounded.
+
         Returns:
             A list of dicts with file metadata (id, filename, mime_type, file_size, sha256).
         """
-        return self.query(
-            """
-            SELECT id, filename, mime_type, file_size, sha256
-            FROM files
-            ORDER BY id DESC
-            """
-        )
+        if limit is not None:
+            return self.query(_STATEMENTS["get_all"] + " LIMIT %s", (limit,))
+        return self.query(self._stmt["get_all"])
+
+    def count_files(self) -> int:
+        """
+        Get the number of rows in the 'files' table.
+
+        Returns:
+            The row count, computed server-side with COUNT(*).
+        """
+        rows = self.query(self._stmt["count"])
+        return int(rows[0]["n"]) if rows else 0
+
+    def get_files_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get one page of file metadata from the 'files' table, newest first.
+
+        Args:
+            offset: Number of rows to skip.
+            limit: Maximum number of rows to return.
+
+        Returns:
+            A list of dicts with file metadata (id, filename, mime_type, file_size, sha256).
+        """
+        return self.query(self._stmt["get_page"], (limit, offset))
 
     def get_file_by_id(self, file_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -229,14 +638,27 @@ class Database:
         Returns:
             A dict with the row data, or None if not found.
         """
-        rows = self.query(
-            """
-            SELECT id, filename, mime_type, file_size, file_data, sha256
-            FROM files
-            WHERE id = %s
-            """,
-            (file_id,),
-        )
+        rows = self.query(self._stmt["get_by_id"], (file_id,))
+        return rows[0] if rows else None
+
+    def get_file_preview(
+        self, file_id: int, preview_len: int = 64
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a file's metadata plus only the first bytes of its data.
+
+        The BLOB is truncated server-side with substr(), so the payload stays
+        tiny no matter how large the stored file is.
+
+        Args:
+            file_id: The ID of the file to retrieve.
+            preview_len: Number of leading bytes of file_data to include.
+
+        Returns:
+            A dict with the row data (file_data holds only the preview bytes),
+            or None if not found.
+        """
+        rows = self.query(self._stmt["get_preview"], (preview_len, file_id))
         return rows[0] if rows else None
 
     def get_file_for_export(self, file_id: int) -> Optional[Dict[str, Any]]:
@@ -249,16 +671,104 @@ class Database:
         Returns:
             A dict with filename, file_data, and sha256, or None if not found.
         """
-        rows = self.query(
-            """
-            SELECT filename, file_data, sha256
-            FROM files
-            WHERE id = %s
-            """,
-            (file_id,),
-        )
+        rows = self.query(self._stmt["get_for_export"], (file_id,))
         return rows[0] if rows else None
 
+    def export_file_to_path(
+        self,
+        file_id: int,
+        out_path: Path,
+        chunk_size: int = 1 << 20,
+        compute_sha: bool = True,
+    ) -> Optional[str]:
+        """
+        Stream a stored file's data straight to a file on disk.
+
+        For SQLite the BLOB is read through incremental blob I/O
+        (Connection.blobopen), so at most chunk_size bytes of file data sit
+        in Python memory at any point. For MySQL the row is fetched and
+        written out in chunks. When compute_sha is set, the SHA256 of the
+        written bytes is computed during the copy, so no separate
+        verification pass is needed; otherwise the copy runs through
+        shutil.copyfileobj's C-level loop.
+
+        Args:
+            file_id: The ID of the file to export.
+            out_path: Destination file path.
+            chunk_size: Bytes per read/write step.
+            compute_sha: Hash the bytes while writing them.
+
+        Returns:
+            The SHA256 hex digest of the written data (an empty string when
+            compute_sha is False), or None if the file was not found.
+        """
+        if not self.query(self._stmt["exists"], (file_id,)):
+            return None
+
+        stream = self.get_file_stream(file_id, chunk_size)
+        if not compute_sha:
+            with out_path.open("wb") as out:
+                shutil.copyfileobj(_ChunkReader(stream), out, chunk_size)
+            return ""
+
+        hasher = hashlib.sha256()
+        with out_path.open("wb") as out:
+            for buf in stream:
+                out.write(buf)
+                hasher.update(buf)
+        return hasher.hexdigest()
+
+    def get_file_stream(
+        self, file_id: int, chunk_size: int = 1 << 20
+    ) -> Iterator[bytes]:
+        """
+        Yield a stored file's data in chunks, never materializing the BLOB.
+
+        SQLite reads through incremental blob I/O (Connection.blobopen);
+        MySQL pages through the column with substr() so at most chunk_size
+        bytes travel per round-trip. Yields nothing if the file does not
+        exist.
+
+        Args:
+            file_id: The ID of the file to read.
+            chunk_size: Maximum bytes per yielded chunk.
+        """
+        if self.engine == "sqlite":
+            with self._acquire() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(self._stmt["exists"], (file_id,))
+                    found = cursor.fetchone()
+                finally:
+                    cursor.close()
+                if not found:
+                    return
+
+                with conn.blobopen(
+                    "files", "file_data", file_id, readonly=True
+                ) as blob:
+                    while True:
+                        buf = blob.read(chunk_size)
+                        if not buf:
+                            return
+                        yield buf
+            return
+
+        offset = 1
+        while True:
+            rows = self.query(
+                self._stmt["get_chunk"], (offset, chunk_size, file_id)
+            )
+            if not rows:
+                return
+            buf = rows[0]["chunk"]
+            if not buf:
+                return
+            yield buf
+            if len(buf) < chunk_size:
+                return
+            offset += len(buf)
+
     def get_last_file(self) -> Optional[Dict[str, Any]]:
         """
         Get the last file stored in the 'files' table (by highest id).
@@ -276,6 +786,23 @@ class Database:
         )
         return rows[0] if rows else None
 
+    def get_last_file_meta(self) -> Optional[Dict[str, Any]]:
+        """
+        Get metadata for the last file stored in the 'files' table (by
+        highest id), without fetching the BLOB.
+
+        Callers that only need to display file info or stream the contents
+        elsewhere (export_file_to_path / get_file_stream) should use this
+        instead of get_last_file, so the whole payload never lands in a
+        Python object.
+
+        Returns:
+            A dict with id, filename, mime_type, file_size and sha256, or
+            None if table is empty.
+        """
+        rows = self.query(self._stmt["get_last_meta"])
+        return rows[0] if rows else None
+
     def vacuum(self) -> None:
         """
         Reclaim unused space in SQLite database.
@@ -284,19 +811,19 @@ class Database:
         if self.engine != "sqlite":
             return
 
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute("VACUUM")
-            conn.commit()
-        finally:
-            cursor.close()
-            conn.close()
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("VACUUM")
+            finally:
+                cursor.close()
 
-    def delete_file(self, file_id: int, vacuum_after: bool = True) -> bool:
+    def delete_file(self, file_id: int, vacuum_after: bool = False) -> bool:
         """
         Delete a file from the database by ID.
         For SQLite, optionally vacuum after deletion to reclaim space.
+        VACUUM rewrites the whole database file, so it is off by default;
+        run it separately (e.g. via vacuum()) when compaction is wanted.
 
         Args:
             file_id: The ID of the file to delete.
@@ -305,82 +832,122 @@ class Database:
         Returns:
             True if a row was deleted, False otherwise.
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        connection_closed = False
-        try:
-            sql = "DELETE FROM files WHERE id = %s"
-            sql_to_run = self._prepare_sql(sql)
-            cursor.execute(sql_to_run, (file_id,))
-            rows_affected = cursor.rowcount
-            conn.commit()
-            
-            if rows_affected == 0:
+        return self.delete_files([file_id], vacuum_after=vacuum_after) > 0
+
+    def delete_files(self, ids: Sequence[int], vacuum_after: bool = False) -> int:
+        """
+        Delete many files from the database in one statement.
+
+        Ids are merged into DELETE ... WHERE id IN (...), chunked to respect
+        the engine's bound-parameter limit, with a single commit and at most
+        one VACUUM at the end.
+
+        Args:
+            ids: The IDs of the files to delete.
+            vacuum_after: If True and using SQLite, vacuum once afterwards.
+
+        Returns:
+            The number of rows actually deleted.
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+
+        rows_per_chunk = 500
+        deleted = 0
+        with self._acquire() as conn:
+            cursor = self._cursor(conn)
+            try:
+                for start in range(0, len(ids), rows_per_chunk):
+                    chunk = ids[start:start + rows_per_chunk]
+                    placeholders = ",".join(["%s"] * len(chunk))
+                    sql = f"DELETE FROM files WHERE id IN ({placeholders})"
+                    cursor.execute(self._prepare_sql(sql), tuple(chunk))
+                    deleted += cursor.rowcount
+                conn.commit()
+            finally:
                 cursor.close()
-                conn.close()
-                return False
-                
-            # Close connection before vacuum (vacuum needs exclusive access)
-            cursor.close()
-            conn.close()
-            connection_closed = True
-                
-            if vacuum_after and self.engine == "sqlite":
-                self.vacuum()
-                
-            return True
-        except Exception:
-            if not connection_closed:
-                try:
-                    cursor.close()
-                except Exception:
-                    pass
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-            raise
+
+        if deleted and vacuum_after and self.engine == "sqlite":
+            self.vacuum()
+
+        return deleted
 
     # ----- Schema helpers -----
 
+    def _schema_key(self) -> tuple:
+        """Identify the target database for the schema-verified cache."""
+        if self.engine == "sqlite":
+            return (self.engine, str(self._sqlite_path()))
+        return (self.engine, self.params["host"], self.params["database"])
+
     def _ensure_files_table(self) -> None:
         """
         Ensure the 'files' table exists for the selected engine.
-        Called automatically on first use.
+        Called automatically on first use; once a database has been verified
+        in this process, later Database instances return immediately.
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        try:
-            if self.engine == "mysql":
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS files (
-                        id INT AUTO_INCREMENT PRIMARY KEY,
-                        filename VARCHAR(255) NOT NULL,
-                        mime_type VARCHAR(255) NOT NULL,
-                        file_size BIGINT NOT NULL,
-                        file_data LONGBLOB NOT NULL,
-                        sha256 CHAR(64) NOT NULL
+        key = self._schema_key()
+        if key in _SCHEMA_READY:
+            return
+
+        with _SCHEMA_LOCK:
+            if key in _SCHEMA_READY:
+                return
+            self._create_files_table()
+            _SCHEMA_READY.add(key)
+
+    def _create_files_table(self) -> None:
+        """Run the CREATE TABLE / CREATE INDEX DDL for the selected engine."""
+        with self._acquire() as conn:
+            cursor = conn.cursor()
+            try:
+                if self.engine == "mysql":
+                    cursor.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS files (
+                            id INT AUTO_INCREMENT PRIMARY KEY,
+                            filename VARCHAR(255) NOT NULL,
+                            mime_type VARCHAR(255) NOT NULL,
+                            file_size BIGINT NOT NULL,
+                            file_data LONGBLOB NOT NULL,
+                            sha256 CHAR(64) NOT NULL
+                        )
+                        """
                     )
-                    """
-                )
-            elif self.engine == "sqlite":
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS files (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        filename TEXT NOT NULL,
-                        mime_type TEXT NOT NULL,
-                        file_size INTEGER NOT NULL,
-                        file_data BLOB NOT NULL,
-                        sha256 TEXT NOT NULL
+                elif self.engine == "sqlite":
+                    cursor.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS files (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            filename TEXT NOT NULL,
+                            mime_type TEXT NOT NULL,
+                            file_size INTEGER NOT NULL,
+                            file_data BLOB NOT NULL,
+                            sha256 TEXT NOT NULL
+                        )
+                        """
                     )
-                    """
-                )
-            conn.commit()
-        finally:
-            cursor.close()
-            conn.close()
+
+                # Index the content hash so dedupe probes are O(log N).
+                # MySQL has no IF NOT EXISTS for indexes, and databases
+                # created before deduplication may already hold duplicate
+                # hashes, so failures here are non-fatal.
+                if self.engine == "mysql":
+                    index_sql = "CREATE UNIQUE INDEX idx_files_sha256 ON files (sha256)"
+                else:
+                    index_sql = (
+                        "CREATE UNIQUE INDEX IF NOT EXISTS idx_files_sha256 "
+                        "ON files (sha256)"
+                    )
+                try:
+                    cursor.execute(index_sql)
+                except Exception:
+                    pass
+
+                conn.commit()
+            finally:
+                cursor.close()
 
 
 # Backwards-compatible alias
@@ -1,6 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import functools
 import hashlib
 import mimetypes
+import mmap
 
 from sql import Database
 
@@ -19,45 +22,72 @@ def check_connection(db: Database) -> None:
         print(f"{db.engine.upper()} connection FAILED (tried db_param.json).")
 
 
-def read_file_bytes(file_path: Path) -> bytes:
-    """Read a file from disk as raw bytes."""
+def open_mapped(file_path: Path) -> mmap.mmap:
+    """
+    Memory-map a file read-only.
+
+    The mapping exposes the file through the buffer protocol, so hashing and
+    the database bind can read it without ever copying the whole file into a
+    Python bytes object. The caller should close() the mapping when done.
+    """
     with file_path.open("rb") as f:
-        return f.read()
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@functools.lru_cache(maxsize=1024)
+def _guess_mime(suffix: str):
+    """Guess a MIME type from a file extension, cached per extension."""
+    mime_type, _ = mimetypes.guess_type(f"file{suffix}")
+    return mime_type
 
 
-def compute_file_metadata(file_path: Path, file_contents: bytes):
-    """Compute filename, MIME type, size and SHA256 hash for a file."""
+def compute_file_metadata(file_path: Path, file_contents):
+    """
+    Compute filename, MIME type, size and SHA256 hash for a file.
+
+    file_contents may be bytes or any buffer (e.g. an mmap from
+    open_mapped); it is never copied here.
+    """
     file_name = file_path.name
-    mime_type, _ = mimetypes.guess_type(str(file_path))
+    mime_type = _guess_mime(file_path.suffix.lower())
     if not mime_type:
         mime_type = "application/octet-stream"
     file_size = len(file_contents)
-    sha256 = hashlib.sha256(file_contents).hexdigest()
+    # hashlib.file_digest (3.11+) streams the file through OpenSSL without a
+    # Python-level loop, hitting the CPU's SHA extensions; the file was just
+    # read, so this pass is served from the page cache.
+    if hasattr(hashlib, "file_digest"):
+        with file_path.open("rb") as f:
+            sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+    else:
+        sha256 = hashlib.sha256(file_contents).hexdigest()
     return file_name, mime_type, file_size, file_contents, sha256
 
 
-def save_backup_file(output_dir: Path, row) -> None:
-    """Save a file row from the database to disk with a '_Beckup' suffix and verify hash."""
+def save_backup_file(db: Database, output_dir: Path, row) -> None:
+    """Stream a file from the database to disk with a '_Beckup' suffix and verify hash."""
     orig_filename = row.get("filename") or "file_from_db.bin"
-    stem, dot, suffix = orig_filename.partition(".")
-    if dot:
-        output_filename = f"{stem}_Beckup.{suffix}"
+    # Path.with_stem keeps the (last) suffix intact and handles names the
+    # old partition(".") munging got wrong, e.g. dotfiles like ".hiddenfile"
+    # (no stem to suffix) and "archive.tar.gz" ("archive.tar_Beckup.gz")
+    p = Path(orig_filename)
+    if p.suffix:
+        output_filename = p.with_stem(p.stem + "_Beckup").name
     else:
-        output_filename = f"{orig_filename}_Beckup"
+        output_filename = orig_filename + "_Beckup"
     output_path = output_dir / output_filename
 
-    # Write file to disk
-    with output_path.open("wb") as f:
-        f.write(row["file_data"])
+    # Stream the BLOB to disk in chunks; the SHA256 of the written bytes is
+    # computed during the copy, so the file is never re-read or held whole
+    # in memory
+    calculated_sha256 = db.export_file_to_path(row["id"], output_path)
+    if calculated_sha256 is None:
+        print("File not found in database.")
+        return
 
     print(f"File saved to: {output_path}")
     print(f"SHA256 from database: {row['sha256']}")
 
-    # Verify SHA256 of the saved file
-    with output_path.open("rb") as f:
-        file_bytes = f.read()
-        calculated_sha256 = hashlib.sha256(file_bytes).hexdigest()
-
     if calculated_sha256 == row["sha256"]:
         print(f"File check: OK (SHA256 matches: {calculated_sha256})")
     else:
@@ -79,28 +109,44 @@ def main() -> None:
             f"'{db.engine}'. Using '{db.engine}'."
         )
 
-    # 1) Check database connection
-    check_connection(db)
-
-    # 2) Read file from disk
+    # 1) Memory-map the file and start hashing it on a worker thread.
+    # hashlib releases the GIL for large buffers, so the SHA256 runs
+    # concurrently with the connection handshake below instead of after it.
     file_path = base_dir / "random_data.bin"
-    file_contents = read_file_bytes(file_path)
-    print(f"File head (first 64 bytes): {file_contents[:64]}")
-
-    # 3) Compute metadata and insert into database via class method
-    file_name, mime_type, file_size, file_data, sha256 = compute_file_metadata(
-        file_path, file_contents
-    )
-    file_id = db.insert_file(file_name, mime_type, file_size, file_data, sha256)
+    file_contents = open_mapped(file_path)
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            metadata_future = pool.submit(
+                compute_file_metadata, file_path, file_contents
+            )
+
+            # 2) Check database connection while the hash is in flight
+            check_connection(db)
+            print(f"File head (first 64 bytes): {file_contents[:64]}")
+
+            file_name, mime_type, file_size, file_data, sha256 = (
+                metadata_future.result()
+            )
+
+        # 3) Insert into database via class method; the mapping is handed to
+        # the driver as a memoryview, so the file bytes are only copied once,
+        # at the bind itself
+        file_id = db.insert_file(
+            file_name, mime_type, file_size, memoryview(file_data), sha256
+        )
+    finally:
+        file_contents.close()
     print(f"File inserted into database with id {file_id}.")
 
-    # 4) Read last file from database and save backup copy
-    row = db.get_last_file()
+    # 4) Read last file's metadata and save a backup copy; the contents are
+    # streamed straight to disk by save_backup_file, so no full BLOB is
+    # ever materialized in Python
+    row = db.get_last_file_meta()
     if not row:
         print("No file found in database.")
         return
 
-    save_backup_file(base_dir, row)
+    save_backup_file(db, base_dir, row)
 
 
 if __name__ == "__main__":